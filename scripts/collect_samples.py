@@ -20,11 +20,15 @@ import logging
 import os
 import re
 import time
-from dataclasses import dataclass, asdict
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict, field
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Optional, Set, Tuple, Any
 from urllib.parse import urljoin, urlparse
-import tempfile
 import subprocess
 
 # Optional imports for full functionality
@@ -50,6 +54,19 @@ except ImportError:
     HAS_REQUESTS = False
     print("Warning: requests/beautifulsoup not available, web scraping disabled")
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import re2
+    # Set ARACHNE_DISABLE_RE2 to fall back to Python's backtracking engine
+    HAS_RE2 = os.getenv('ARACHNE_DISABLE_RE2') is None
+except ImportError:
+    HAS_RE2 = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -61,6 +78,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+GITHUB_SEARCH_URL = "https://api.github.com/search/code"
+
+# Regex flags applied to every signature pattern (inline form for RE2, keep in sync).
+# Patterns spell out cross-line spans as [\s\S] so DOTALL is not needed.
+SIGNATURE_FLAGS = re.IGNORECASE
+SIGNATURE_INLINE_FLAGS = "(?i)"
+
+
+@lru_cache(maxsize=2048)
+def compile_signature_pattern(pattern: str) -> Any:
+    """Compile a signature pattern, preferring RE2's linear-time engine when installed.
+
+    Compiled patterns are immutable, so identical pattern text shared by several
+    signatures, or reloaded with a fresh detector, compiles only once.
+    """
+    if HAS_RE2:
+        try:
+            return re2.compile(SIGNATURE_INLINE_FLAGS + pattern)
+        except re2.error as e:
+            logger.debug(f"RE2 rejected pattern {pattern}, using re: {e}")
+    return re.compile(pattern, SIGNATURE_FLAGS)
+
+
+def _match_example(match: Any) -> Any:
+    """Render a match the way re.findall reports it (whole match or captured groups)."""
+    groups = tuple('' if group is None else group for group in match.groups())
+    if not groups:
+        return match.group(0)
+    return groups[0] if len(groups) == 1 else groups
+
 
 @dataclass
 class ObfuscationSignature:
@@ -69,22 +116,42 @@ class ObfuscationSignature:
     description: str
     patterns: List[str]  # Regex patterns
     confidence_threshold: float = 0.7
+    # Every pattern needs one of these substrings (case-insensitive); empty means always scan
+    required_literals: List[str] = field(default_factory=list)
+    compiled: List[Any] = field(init=False, repr=False)  # re.Pattern or RE2 equivalent
+    
+    def __post_init__(self):
+        """Compile patterns once so classification never re-parses them."""
+        self.required_literals = [literal.casefold() for literal in self.required_literals]
+        self.compiled = []
+        for pattern in self.patterns:
+            try:
+                self.compiled.append(compile_signature_pattern(pattern))
+            except re.error as e:
+                raise ValueError(f"Invalid regex in signature '{self.name}': {pattern} ({e})") from e
 
 
 @dataclass
 class Sample:
-    """Represents a collected JavaScript sample."""
+    """Represents a collected JavaScript sample.
+    
+    content_bytes is the payload as fetched and is what gets hashed,
+    validated and saved; content is its decoded text for classification.
+    """
     content: str
     source_url: Optional[str]
     file_hash: str
     file_size: int
     classification: Dict[str, Any]
     metadata: Dict[str, Any]
+    content_bytes: bytes = field(default=b'', repr=False)  # Raw payload (UTF-8)
     
     def __post_init__(self):
-        """Generate hash if not provided."""
+        """Encode content and generate hash if not provided."""
+        if not self.content_bytes:
+            self.content_bytes = self.content.encode('utf-8')
         if not self.file_hash:
-            self.file_hash = hashlib.sha256(self.content.encode('utf-8')).hexdigest()
+            self.file_hash = hashlib.sha256(self.content_bytes).hexdigest()
 
 
 @dataclass
@@ -94,12 +161,84 @@ class CollectionConfig:
     max_samples_per_source: int = 50
     min_file_size: int = 1024  # 1KB
     max_file_size: int = 1024 * 1024  # 1MB
-    rate_limit_delay: float = 1.0  # seconds between requests
+    rate_limit_delay: float = 1.0  # base backoff (seconds) when a host throttles requests
+    max_retries: int = 3  # retries for throttled (403/429) responses
     timeout_seconds: int = 30
     enable_github_collection: bool = True
     enable_malwarebazaar_collection: bool = True
     enable_academic_collection: bool = True
     github_token: Optional[str] = None  # Set via environment variable
+    max_connections: int = 128  # Pooled HTTP connections across all hosts
+    max_connections_per_host: int = 8
+    max_concurrent_searches: int = 2  # GitHub discourages concurrent search API calls
+    classification_workers: Optional[int] = None  # Defaults to CPU count; 0 classifies in-process
+    validation_workers: Optional[int] = None  # Node syntax-check processes; defaults to CPU count
+    max_concurrent_writes: int = 64  # Sample files written at once when aiofiles is available
+    prescreen_min_score: float = 0.0001  # Marker density below which fetched files skip classification; 0 disables
+
+
+@dataclass
+class HostQuota:
+    """Request quota a host last reported through X-RateLimit-* headers."""
+    remaining: Optional[int] = None  # None until the host reports a quota
+    reset_at: float = 0.0  # epoch seconds when the quota refills
+
+
+class RateLimiter:
+    """Per-host request gate driven by rate limit response headers.
+    
+    Requests go out immediately while a host reports quota left and only
+    wait for the reset once it is used up. Throttled responses are retried
+    after Retry-After or an exponential backoff.
+    """
+    
+    def __init__(self, backoff_base: float = 1.0, max_backoff: float = 60.0):
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.quotas: Dict[str, HostQuota] = {}
+    
+    async def acquire(self, url: str) -> None:
+        """Wait until the URL's host has quota for one more request."""
+        host = urlparse(url).netloc
+        quota = self.quotas.setdefault(host, HostQuota())
+        while quota.remaining is not None and quota.remaining <= 0:
+            delay = quota.reset_at - time.time()
+            if delay <= 0:
+                quota.remaining = None  # Window has reset; learn the new quota
+                break
+            logger.info(f"Rate limit exhausted for {host}, waiting {delay:.0f}s")
+            await asyncio.sleep(delay)
+        
+        if quota.remaining is not None:
+            quota.remaining -= 1  # Account for the request now in flight
+    
+    def update(self, url: str, headers: Any) -> None:
+        """Record the quota reported by a response."""
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        quota = self.quotas.setdefault(urlparse(url).netloc, HostQuota())
+        try:
+            quota.remaining = int(remaining)
+            quota.reset_at = float(headers.get('X-RateLimit-Reset', 0))
+        except ValueError:
+            logger.debug(f"Ignoring malformed rate limit headers from {url}")
+    
+    def retry_delay(self, status: int, headers: Any, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a throttled response, or None if not throttled."""
+        retry_after = headers.get('Retry-After')
+        exhausted = headers.get('X-RateLimit-Remaining') == '0'
+        if status != 429 and not (status == 403 and (retry_after or exhausted)):
+            return None
+        
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        if exhausted:
+            try:
+                return max(0.0, float(headers.get('X-RateLimit-Reset', 0)) - time.time())
+            except ValueError:
+                pass
+        return min(self.max_backoff, self.backoff_base * (1 << attempt))
 
 
 class ObfuscationDetector:
@@ -107,6 +246,15 @@ class ObfuscationDetector:
     
     def __init__(self):
         self.signatures = self._initialize_signatures()
+        # Alternation of every signature pattern: a single search either proves
+        # that nothing matches or yields the earliest offset any pattern can match.
+        # Only RE2's automaton makes that one pass cheap; Python's backtracking
+        # engine retries every alternative at each offset and is slower than the
+        # separate scans, so the screen is skipped there.
+        union_pattern = compile_signature_pattern(
+            "|".join(f"(?:{pattern})" for signature in self.signatures for pattern in signature.patterns)
+        )
+        self.union_pattern = None if isinstance(union_pattern, re.Pattern) else union_pattern
     
     def _initialize_signatures(self) -> List[ObfuscationSignature]:
         """Initialize obfuscation detection signatures."""
@@ -116,18 +264,20 @@ class ObfuscationDetector:
                 description="String array with encoded/encrypted strings",
                 patterns=[
                     r'var\s+\w+\s*=\s*\[\s*["\'][\w\+/=]{20,}["\'](?:\s*,\s*["\'][\w\+/=]{20,}["\'])*\s*\]',
-                    r'_0x\w{4,}\[.*?\]',
+                    r'_0x\w{4,}\[[^\]]*\]',
                     r'\w+\[\w+\s*\^\s*\w+\]'
-                ]
+                ],
+                required_literals=['var', '_0x', '^']
             ),
             ObfuscationSignature(
                 name="control_flow_flattening",
                 description="Control flow flattening with switch dispatcher",
                 patterns=[
-                    r'while\s*\(\s*!!\s*\[\s*\]\s*\)\s*\{.*?switch\s*\(',
+                    r'while\s*\(\s*!!\s*\[\s*\]\s*\)\s*\{[\s\S]*?switch\s*\(',
                     r'case\s+["\']?\w+["\']?\s*:\s*\w+\s*=\s*["\']?\w+["\']?',
                     r'_\w+\[\w+\+\+\]'
-                ]
+                ],
+                required_literals=['switch', 'case', '++']
             ),
             ObfuscationSignature(
                 name="vm_based_obfuscation",
@@ -135,18 +285,20 @@ class ObfuscationDetector:
                 patterns=[
                     r'function\s+\w*vm\w*\s*\(',
                     r'eval\s*\(\s*String\.fromCharCode\s*\(',
-                    r'function.*?{\s*var\s+\w+\s*=\s*arguments\s*;.*?switch\s*\(\s*\w+\s*\[\s*\w+\s*\+\+\s*\]\s*\)',
-                    r'new\s+Function\s*\(\s*["\'][^"\']*["\'],.*?\)'
-                ]
+                    r'function[^{]*\{\s*var\s+\w+\s*=\s*arguments\s*;[\s\S]*?switch\s*\(\s*\w+\s*\[\s*\w+\s*\+\+\s*\]\s*\)',
+                    r'new\s+Function\s*\(\s*["\'][^"\']*["\'],[^)]*\)'
+                ],
+                required_literals=['function', 'eval']
             ),
             ObfuscationSignature(
                 name="dead_code_insertion",
                 description="Dead code and bogus constructs",
                 patterns=[
-                    r'if\s*\(\s*false\s*\)\s*\{[\s\S]*?\}',
+                    r'if\s*\(\s*false\s*\)\s*\{[^}]*\}',
                     r'true\s*&&\s*false',
                     r'undefined\s*\|\|\s*null'
-                ]
+                ],
+                required_literals=['false', 'null']
             ),
             ObfuscationSignature(
                 name="identifier_renaming",
@@ -154,8 +306,9 @@ class ObfuscationDetector:
                 patterns=[
                     r'var\s+(_0x[a-f0-9]+|[a-zA-Z]\$[a-zA-Z0-9_\$]*)\s*=',
                     r'function\s+(_0x[a-f0-9]+|[a-zA-Z]\$[a-zA-Z0-9_\$]*)\s*\(',
-                    r'[a-zA-Z_\$][a-zA-Z0-9_\$]*\[\s*["\'][a-f0-9]{6,}["\'].*?\]'
-                ]
+                    r'[a-zA-Z_\$][a-zA-Z0-9_\$]*\[\s*["\'][a-f0-9]{6,}["\'][^\]]*\]'
+                ],
+                required_literals=['var', 'function', '[']
             ),
             ObfuscationSignature(
                 name="eval_patterns",
@@ -165,7 +318,8 @@ class ObfuscationDetector:
                     r'Function\s*\(\s*["\']return\s+',
                     r'setTimeout\s*\(\s*["\'][^"\']+["\']',
                     r'setInterval\s*\(\s*["\'][^"\']+["\']'
-                ]
+                ],
+                required_literals=['eval', 'function', 'settimeout', 'setinterval']
             )
         ]
     
@@ -179,21 +333,37 @@ class ObfuscationDetector:
             "patterns_detected": []
         }
         
+        # Content without a single hit needs one pass instead of one per pattern
+        start = 0
+        if self.union_pattern is not None:
+            first_hit = self.union_pattern.search(content)
+            if first_hit is None:
+                return classification
+            start = first_hit.start()
+        folded = content.casefold()
+        
         total_score = 0.0
         detected_patterns = []
         
         for signature in self.signatures:
+            # Substring checks are far cheaper than regex scans that cannot match
+            if signature.required_literals and not any(
+                literal in folded for literal in signature.required_literals
+            ):
+                continue
+            
             matches = 0
             pattern_details = []
             
-            for pattern in signature.patterns:
-                try:
-                    pattern_matches = re.findall(pattern, content, re.IGNORECASE | re.MULTILINE | re.DOTALL)
-                    if pattern_matches:
-                        matches += len(pattern_matches)
-                        pattern_details.extend(pattern_matches[:3])  # Limit examples
-                except re.error as e:
-                    logger.warning(f"Regex error in pattern {pattern}: {e}")
+            for compiled in signature.compiled:
+                # No pattern matches before the union's first hit; count matches
+                # without materializing them, keeping only a few as examples
+                examples = 0
+                for match in compiled.finditer(content, start):
+                    matches += 1
+                    if examples < 3:  # Limit examples
+                        pattern_details.append(_match_example(match))
+                        examples += 1
             
             if matches > 0:
                 # Score based on frequency and pattern strength
@@ -220,14 +390,143 @@ class ObfuscationDetector:
         return classification
 
 
+# Byte markers of the techniques the signatures look for: hex-named identifiers,
+# escaped string payloads, runtime code construction and switch dispatchers
+QUICK_SCORE_MARKERS = (b'_0x', b'\\x', b'\\u', b'fromCharCode', b'eval(', b'Function(', b'switch')
+
+
+def _quick_score(content: bytes) -> float:
+    """Density of obfuscation markers per byte; a cheap screen ahead of classification."""
+    if not content:
+        return 0.0
+    return sum(content.count(marker) for marker in QUICK_SCORE_MARKERS) / len(content)
+
+
+# Detector owned by each classification pool worker process
+_worker_detector: Optional[ObfuscationDetector] = None
+
+
+def _classify_worker(content: str) -> Dict[str, Any]:
+    """Classify a sample inside a pool worker, compiling signatures once per process."""
+    global _worker_detector
+    if _worker_detector is None:
+        _worker_detector = ObfuscationDetector()
+    return _worker_detector.classify_sample(content)
+
+
+# Node.js program that syntax-checks length-prefixed sources read from stdin.
+# Sources compile as CommonJS function bodies, falling back to ES module
+# parsing, which mirrors what `node --check` accepts.
+NODE_CHECKER_SOURCE = r"""
+const vm = require('vm');
+const params = ['exports', 'require', 'module', '__filename', '__dirname'];
+function check(source) {
+  source = source.replace(/^#!.*/, '');
+  try {
+    vm.compileFunction(source, params);
+  } catch (e) {
+    try { new vm.SourceTextModule(source); } catch (e2) { return false; }
+  }
+  return true;
+}
+let header = '';
+let body = null;  // Preallocated buffer for the source being received
+let filled = 0;
+process.stdin.on('data', (chunk) => {
+  let offset = 0;
+  while (offset < chunk.length) {
+    if (body === null) {
+      const newline = chunk.indexOf(10, offset);
+      if (newline < 0) {
+        header += chunk.toString('latin1', offset);
+        return;
+      }
+      header += chunk.toString('latin1', offset, newline);
+      body = Buffer.allocUnsafe(Number(header));
+      header = '';
+      filled = 0;
+      offset = newline + 1;
+    }
+    const copied = chunk.copy(body, filled, offset, Math.min(chunk.length, offset + body.length - filled));
+    filled += copied;
+    offset += copied;
+    if (filled === body.length) {
+      process.stdout.write(check(body.toString('utf8')) ? 'OK\n' : 'ERR\n');
+      body = null;
+    }
+  }
+});
+"""
+
+
+class NodeSyntaxChecker:
+    """Long-lived Node.js process that syntax-checks JavaScript sources.
+    
+    Pays Node startup once per collection run instead of spawning
+    `node --check` (and writing a temp file) for every sample.
+    """
+    
+    def __init__(self, timeout: float = 5.0):
+        self.timeout = timeout
+        self.process: Optional[subprocess.Popen] = None
+        # Replies are read on a helper thread so waiting for them can time out
+        # portably; select() only polls pipes on POSIX
+        self.reader: Optional[ThreadPoolExecutor] = None
+    
+    def check(self, content: bytes) -> bool:
+        """Return whether UTF-8 source parses; raises if the worker fails or times out."""
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(
+                ['node', '--experimental-vm-modules', '--no-warnings', '-e', NODE_CHECKER_SOURCE],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            self.reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='node-checker')
+        
+        try:
+            # Separate writes avoid copying the payload just to prepend its length
+            self.process.stdin.write(b'%d\n' % len(content))
+            self.process.stdin.write(content)
+            self.process.stdin.flush()
+            try:
+                reply = self.reader.submit(self.process.stdout.readline).result(timeout=self.timeout)
+            except FutureTimeoutError:
+                raise subprocess.TimeoutExpired('node', self.timeout) from None
+            if not reply:
+                raise RuntimeError("Node syntax checker exited unexpectedly")
+        except Exception:
+            self.close()
+            raise
+        
+        return reply == b'OK\n'
+    
+    def close(self) -> None:
+        """Stop the worker process."""
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+        if self.reader is not None:
+            # Killing the process unblocks any pending read with EOF
+            self.reader.shutdown(wait=False)
+            self.reader = None
+
+
 class SampleCollector:
     """Main sample collection class."""
     
     def __init__(self, config: CollectionConfig):
         self.config = config
         self.detector = ObfuscationDetector()
-        self.collected_hashes: Set[str] = set()
+        self.collected_hashes: Set[bytes] = set()  # Raw SHA-256 digests (half the size of hex strings)
         self.session: Optional[aiohttp.ClientSession] = None
+        self.rate_limiter = RateLimiter(backoff_base=config.rate_limit_delay)
+        self.classification_pool: Optional[ProcessPoolExecutor] = None
+        self.classification_workers = 0
+        self.js_checkers = [
+            NodeSyntaxChecker() for _ in range(max(1, config.validation_workers or os.cpu_count() or 1))
+        ]
         
         # Create output directory
         self.config.output_dir.mkdir(parents=True, exist_ok=True)
@@ -235,7 +534,12 @@ class SampleCollector:
     async def __aenter__(self):
         """Async context manager entry."""
         if HAS_AIOHTTP:
-            connector = aiohttp.TCPConnector(limit=10, limit_per_host=2)
+            # Keep-alive connections are pooled and reused, so TLS handshakes amortize
+            connector = aiohttp.TCPConnector(
+                limit=self.config.max_connections,
+                limit_per_host=self.config.max_connections_per_host,
+                ttl_dns_cache=300
+            )
             timeout = aiohttp.ClientTimeout(total=self.config.timeout_seconds)
             self.session = aiohttp.ClientSession(
                 connector=connector,
@@ -247,12 +551,54 @@ class SampleCollector:
         else:
             self.session = None
             logger.warning("HTTP session disabled: aiohttp not available")
+        
+        # Classification is CPU-bound regex work, so spread it across processes
+        workers = self.config.classification_workers
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 0:
+            self.classification_pool = ProcessPoolExecutor(max_workers=workers)
+            self.classification_workers = workers
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
         if self.session:
             await self.session.close()
+        if self.classification_pool:
+            self.classification_pool.shutdown()
+            self.classification_pool = None
+        for checker in self.js_checkers:
+            checker.close()
+    
+    async def _classify(self, content: str) -> Dict[str, Any]:
+        """Classify a sample without blocking the event loop when the worker pool is running."""
+        if self.classification_pool is None:
+            return self.detector.classify_sample(content)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.classification_pool, _classify_worker, content)
+    
+    def _classify_batch(self, contents: List[str]) -> List[Dict[str, Any]]:
+        """Classify many samples, spreading them across the worker pool when it is running."""
+        if self.classification_pool is None:
+            return [self.detector.classify_sample(content) for content in contents]
+        chunksize = max(1, len(contents) // (self.classification_workers * 4))
+        return list(self.classification_pool.map(_classify_worker, contents, chunksize=chunksize))
+    
+    @asynccontextmanager
+    async def _get(self, url: str, **kwargs):
+        """GET a URL under the rate limiter, retrying throttled responses."""
+        for attempt in range(self.config.max_retries + 1):
+            await self.rate_limiter.acquire(url)
+            async with self.session.get(url, **kwargs) as response:
+                self.rate_limiter.update(url, response.headers)
+                delay = self.rate_limiter.retry_delay(response.status, response.headers, attempt)
+                if delay is None or attempt == self.config.max_retries:
+                    yield response
+                    return
+            
+            logger.warning(f"Throttled by {urlparse(url).netloc} ({response.status}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
     
     async def collect_all_sources(self) -> List[Sample]:
         """Collect samples from all enabled sources."""
@@ -286,7 +632,7 @@ class SampleCollector:
                 logger.error(f"Academic collection failed: {e}")
         
         # Filter and deduplicate
-        filtered_samples = self.filter_and_deduplicate(all_samples)
+        filtered_samples = await self.filter_and_deduplicate(all_samples)
         logger.info(f"After filtering: {len(filtered_samples)} unique samples")
         
         return filtered_samples
@@ -336,37 +682,55 @@ class SampleCollector:
         if self.config.github_token:
             headers['Authorization'] = f'token {self.config.github_token}'
         
-        for query in queries:
-            try:
-                await self._rate_limit_delay()
-                
-                # Search API
-                search_url = "https://api.github.com/search/code"
-                params = {
-                    'q': query,
-                    'sort': 'indexed',
-                    'per_page': min(10, self.config.max_samples_per_source // len(queries))
-                }
-                
-                async with self.session.get(search_url, params=params, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        for item in data.get('items', []):
-                            sample = await self._fetch_github_file(item, headers)
-                            if sample:
-                                samples.append(sample)
-                                
-                                if len(samples) >= self.config.max_samples_per_source:
-                                    break
-                    else:
-                        logger.warning(f"GitHub API error: {response.status}")
-                        
-            except Exception as e:
-                logger.error(f"GitHub collection error for query '{query}': {e}")
+        # Parameters shared by every search; only 'q' varies per query
+        search_params = {
+            'sort': 'indexed',
+            'per_page': min(10, self.config.max_samples_per_source // len(queries))
+        }
+        
+        # Overlap query latency; all queries share one result list and limit
+        search_slots = asyncio.Semaphore(self.config.max_concurrent_searches)
+        await asyncio.gather(*(
+            self._search_github(query, search_params, headers, samples, search_slots)
+            for query in queries
+        ))
         
         return samples
     
+    async def _search_github(
+        self,
+        query: str,
+        search_params: Dict[str, Any],
+        headers: Dict[str, str],
+        samples: List[Sample],
+        search_slots: asyncio.Semaphore
+    ) -> None:
+        """Run one GitHub code search and append the samples it yields."""
+        try:
+            # Search API; the slot only guards the search call, not the downloads
+            async with search_slots:
+                params = {**search_params, 'q': query}
+                async with self._get(GITHUB_SEARCH_URL, params=params, headers=headers) as response:
+                    if response.status != 200:
+                        logger.warning(f"GitHub API error: {response.status}")
+                        return
+                    data = await response.json()
+            
+            items = data.get('items', [])
+            if len(samples) >= self.config.max_samples_per_source:
+                return
+            
+            fetched = await asyncio.gather(*(self._fetch_github_file(item, headers) for item in items))
+            
+            for sample in fetched:
+                if len(samples) >= self.config.max_samples_per_source:
+                    break
+                if sample:
+                    samples.append(sample)
+                    
+        except Exception as e:
+            logger.error(f"GitHub collection error for query '{query}': {e}")
+    
     async def _fetch_github_file(self, item: Dict[str, Any], headers: Dict[str, str]) -> Optional[Sample]:
         """Fetch a specific file from GitHub."""
         try:
@@ -374,35 +738,40 @@ class SampleCollector:
             if not download_url:
                 return None
             
-            await self._rate_limit_delay()
-            
-            async with self.session.get(download_url, headers=headers) as response:
+            async with self._get(download_url, headers=headers) as response:
                 if response.status == 200:
-                    content = await response.text()
+                    # Keep the raw bytes for hashing, validation and saving
+                    content_bytes = await self._read_capped(response, self.config.max_file_size)
                     
                     # Size check
-                    if not (self.config.min_file_size <= len(content) <= self.config.max_file_size):
+                    if content_bytes is None or len(content_bytes) < self.config.min_file_size:
                         return None
                     
                     # Check if already collected
-                    file_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
-                    if file_hash in self.collected_hashes:
+                    digest = hashlib.sha256(content_bytes).digest()
+                    if digest in self.collected_hashes:
+                        return None
+                    
+                    # Files with hardly any obfuscation markers are not worth a full scan
+                    if _quick_score(content_bytes) < self.config.prescreen_min_score:
                         return None
                     
-                    # Classify obfuscation
-                    classification = self.detector.classify_sample(content)
+                    # Classify obfuscation (the only step that needs text)
+                    content = content_bytes.decode('utf-8', errors='replace')
+                    classification = await self._classify(content)
                     
                     # Only include if it appears obfuscated
                     if not classification["is_obfuscated"]:
                         return None
                     
-                    self.collected_hashes.add(file_hash)
+                    self.collected_hashes.add(digest)
                     
                     return Sample(
                         content=content,
+                        content_bytes=content_bytes,
                         source_url=item.get('html_url'),
-                        file_hash=file_hash,
-                        file_size=len(content),
+                        file_hash=digest.hex(),
+                        file_size=len(content_bytes),
                         classification=classification,
                         metadata={
                             'source': 'github',
@@ -416,6 +785,23 @@ class SampleCollector:
         
         return None
     
+    @staticmethod
+    async def _read_capped(response: Any, limit: int) -> Optional[bytes]:
+        """Read a response body, giving up as soon as it exceeds ``limit`` bytes.
+
+        Oversized files are rejected from Content-Length when the server sends
+        it, and otherwise after at most ``limit`` bytes have been buffered.
+        """
+        if response.content_length is not None and response.content_length > limit:
+            return None
+        
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            body += chunk
+            if len(body) > limit:
+                return None
+        return bytes(body)
+    
     async def collect_from_academic_datasets(self) -> List[Sample]:
         """Collect from academic research datasets."""
         samples = []
@@ -507,17 +893,20 @@ eval(_0xeval + '("Hello World");');
             """
         ]
         
+        contents = [content.strip() for content in synthetic_samples]
+        classifications = self._classify_batch(contents)
+        
         samples = []
-        for i, content in enumerate(synthetic_samples):
-            content = content.strip()
-            file_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
-            classification = self.detector.classify_sample(content)
+        for i, (content, classification) in enumerate(zip(contents, classifications)):
+            content_bytes = content.encode('utf-8')
+            file_hash = hashlib.sha256(content_bytes).hexdigest()
             
             sample = Sample(
                 content=content,
+                content_bytes=content_bytes,
                 source_url=None,
                 file_hash=file_hash,
-                file_size=len(content),
+                file_size=len(content_bytes),
                 classification=classification,
                 metadata={
                     'source': 'synthetic',
@@ -534,17 +923,11 @@ eval(_0xeval + '("Hello World");');
             
         return samples
     
-    def filter_and_deduplicate(self, samples: List[Sample]) -> List[Sample]:
+    async def filter_and_deduplicate(self, samples: List[Sample]) -> List[Sample]:
         """Filter and deduplicate collected samples."""
-        filtered = []
-        seen_hashes = set()
+        candidates = []
         
         for sample in samples:
-            # Skip if already seen
-            if sample.file_hash in seen_hashes:
-                logger.info(f"Skipping duplicate hash: {sample.file_hash[:8]}")
-                continue
-            
             # Size filter
             if not (self.config.min_file_size <= sample.file_size <= self.config.max_file_size):
                 logger.info(f"Skipping size filter: {sample.file_size} not in {self.config.min_file_size}-{self.config.max_file_size}")
@@ -557,8 +940,23 @@ eval(_0xeval + '("Hello World");');
                 logger.info(f"Skipping obfuscation threshold: {sample.classification.get('overall_score', 0)} < {min_threshold}")
                 continue
             
+            candidates.append(sample)
+        
+        # Validate each distinct candidate once, in parallel across the Node workers
+        contents = {sample.file_hash: sample.content_bytes for sample in candidates}
+        verdicts = dict(zip(contents, await self._validate_concurrently(list(contents.values()))))
+        
+        filtered = []
+        seen_hashes = set()
+        
+        for sample in candidates:
+            # Skip if already seen
+            if sample.file_hash in seen_hashes:
+                logger.info(f"Skipping duplicate hash: {sample.file_hash[:8]}")
+                continue
+            
             # Basic content validation
-            if not self._is_valid_javascript(sample.content):
+            if not verdicts[sample.file_hash]:
                 logger.info(f"Skipping JS validation failure for sample {sample.file_hash[:8]}")
                 continue
             
@@ -568,49 +966,38 @@ eval(_0xeval + '("Hello World");');
         
         return filtered
     
-    def _is_valid_javascript(self, content: str) -> bool:
-        """Basic JavaScript syntax validation."""
-        try:
-            # Use node.js to validate syntax
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-                f.write(content)
-                temp_path = f.name
-            
+    async def _validate_concurrently(self, contents: List[bytes]) -> List[bool]:
+        """Syntax-check sources in parallel, with one check in flight per Node worker."""
+        idle_checkers: asyncio.Queue = asyncio.Queue()
+        for checker in self.js_checkers:
+            idle_checkers.put_nowait(checker)
+        
+        async def validate(content: bytes) -> bool:
+            checker = await idle_checkers.get()
             try:
-                # Check syntax using node
-                result = subprocess.run(
-                    ['node', '--check', temp_path],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                return result.returncode == 0
+                return await asyncio.to_thread(self._is_valid_javascript, content, checker)
             finally:
-                os.unlink(temp_path)
+                idle_checkers.put_nowait(checker)
+        
+        return await asyncio.gather(*(validate(content) for content in contents))
+    
+    def _is_valid_javascript(self, content: bytes, checker: NodeSyntaxChecker) -> bool:
+        """Basic JavaScript syntax validation."""
+        try:
+            # Use a long-lived node.js worker to validate syntax
+            return checker.check(content)
         except Exception:
             # If validation fails, be conservative and assume it's valid
             return True
     
-    async def _rate_limit_delay(self) -> None:
-        """Apply rate limiting delay."""
-        await asyncio.sleep(self.config.rate_limit_delay)
-    
     async def save_samples(self, samples: List[Sample]) -> Dict[str, Any]:
         """Save samples to disk and generate configuration."""
         sample_metadata = []
+        sample_files = []
         
         for i, sample in enumerate(samples):
-            # Save sample file
             sample_filename = f"wild_sample_{i:03d}_{sample.file_hash[:8]}.js"
-            sample_path = self.config.output_dir / sample_filename
-            
-            # Use async file operations if available, otherwise sync
-            if HAS_AIOFILES:
-                async with aiofiles.open(sample_path, 'w', encoding='utf-8') as f:
-                    await f.write(sample.content)
-            else:
-                with open(sample_path, 'w', encoding='utf-8') as f:
-                    f.write(sample.content)
+            sample_files.append((self.config.output_dir / sample_filename, sample.content_bytes))
             
             # Collect metadata
             metadata = {
@@ -623,17 +1010,34 @@ eval(_0xeval + '("Hello World");');
             }
             
             sample_metadata.append(metadata)
-            logger.info(f"Saved sample: {sample_filename}")
+        
+        # Save sample files, overlapping the writes if async file operations are available
+        if HAS_AIOFILES:
+            write_slots = asyncio.Semaphore(self.config.max_concurrent_writes)
+            await asyncio.gather(*(
+                self._write_file(path, data, write_slots) for path, data in sample_files
+            ))
+        else:
+            for path, data in sample_files:
+                with open(path, 'wb') as f:
+                    f.write(data)
+        
+        for metadata in sample_metadata:
+            logger.info(f"Saved sample: {metadata['filename']}")
         
         # Save metadata index
         metadata_file = self.config.output_dir / "samples_metadata.json"
-        metadata_json = json.dumps(sample_metadata, indent=2)
+        if HAS_ORJSON:
+            # Serializes straight to UTF-8 bytes in C, without an intermediate str
+            metadata_json = orjson.dumps(sample_metadata, option=orjson.OPT_INDENT_2)
+        else:
+            metadata_json = json.dumps(sample_metadata, indent=2).encode('utf-8')
         
         if HAS_AIOFILES:
-            async with aiofiles.open(metadata_file, 'w', encoding='utf-8') as f:
+            async with aiofiles.open(metadata_file, 'wb') as f:
                 await f.write(metadata_json)
         else:
-            with open(metadata_file, 'w', encoding='utf-8') as f:
+            with open(metadata_file, 'wb') as f:
                 f.write(metadata_json)
         
         # Generate statistics
@@ -646,38 +1050,52 @@ eval(_0xeval + '("Hello World");');
             'statistics': stats
         }
     
+    async def _write_file(self, path: Path, data: bytes, write_slots: asyncio.Semaphore) -> None:
+        """Write a file asynchronously once a write slot is free."""
+        async with write_slots:
+            async with aiofiles.open(path, 'wb') as f:
+                await f.write(data)
+    
     def _generate_statistics(self, samples: List[Sample]) -> Dict[str, Any]:
-        """Generate collection statistics."""
-        stats = {
+        """Generate collection statistics in a single pass over the samples."""
+        confidence_ranges = [(0, 0.3), (0.3, 0.6), (0.6, 0.8), (0.8, 1.0)]
+        confidence_counts = [0] * len(confidence_ranges)
+        sources: Counter = Counter()
+        techniques: Counter = Counter()
+        min_size = max_size = samples[0].file_size if samples else 0
+        total_size = 0
+        
+        for sample in samples:
+            # Size distribution
+            total_size += sample.file_size
+            min_size = min(min_size, sample.file_size)
+            max_size = max(max_size, sample.file_size)
+            
+            # Source and obfuscation technique distribution
+            sources[sample.metadata.get('source', 'unknown')] += 1
+            techniques.update(sample.classification.get('techniques', {}).keys())
+            
+            # Confidence distribution
+            confidence = sample.classification.get('confidence', 0)
+            for index, (low, high) in enumerate(confidence_ranges):
+                if low <= confidence < high:
+                    confidence_counts[index] += 1
+                    break
+        
+        return {
             'total_samples': len(samples),
-            'sources': {},
-            'obfuscation_techniques': {},
+            'sources': dict(sources),
+            'obfuscation_techniques': dict(techniques),
             'size_distribution': {
-                'min': min(s.file_size for s in samples) if samples else 0,
-                'max': max(s.file_size for s in samples) if samples else 0,
-                'avg': sum(s.file_size for s in samples) // len(samples) if samples else 0
+                'min': min_size,
+                'max': max_size,
+                'avg': total_size // len(samples) if samples else 0
             },
-            'confidence_distribution': {}
+            'confidence_distribution': {
+                f"{low:.1f}-{high:.1f}": count
+                for (low, high), count in zip(confidence_ranges, confidence_counts)
+            }
         }
-        
-        # Source distribution
-        for sample in samples:
-            source = sample.metadata.get('source', 'unknown')
-            stats['sources'][source] = stats['sources'].get(source, 0) + 1
-        
-        # Obfuscation technique distribution
-        for sample in samples:
-            for technique in sample.classification.get('techniques', {}):
-                stats['obfuscation_techniques'][technique] = stats['obfuscation_techniques'].get(technique, 0) + 1
-        
-        # Confidence distribution
-        confidence_ranges = [(0, 0.3), (0.3, 0.6), (0.6, 0.8), (0.8, 1.0)]
-        for low, high in confidence_ranges:
-            range_key = f"{low:.1f}-{high:.1f}"
-            count = sum(1 for s in samples if low <= s.classification.get('confidence', 0) < high)
-            stats['confidence_distribution'][range_key] = count
-        
-        return stats
 
 
 async def main():
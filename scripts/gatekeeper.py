@@ -6,28 +6,79 @@ Comprehensive quality gate checking with risk scoring algorithm.
 Implements promotion rule enforcement and automated decision making.
 """
 
+import hashlib
 import json
+import operator
+import os
+import re
+import statistics
 import subprocess
 import sys
+import threading
 import time
-from dataclasses import dataclass, field
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 from enum import Enum
 import argparse
 import logging
 
+# Optional in-process git access; falls back to the git CLI
+try:
+    import pygit2
+    HAS_PYGIT2 = True
+except ImportError:
+    HAS_PYGIT2 = False
+
+# Optional fast JSON for npm audit input and the report output
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Exit statuses meaning a command produced no result at all rather than a bad one:
+# its program was not executable or not found (126, 127, e.g. node_modules not
+# installed); negative values are deaths by signal, such as a CI timeout or OOM kill
+NO_RESULT_EXIT_CODES = frozenset({126, 127})
+
+# Directories never counted towards project size: dependencies, VCS data and build output
+LOC_SKIP_DIRS = frozenset({'node_modules', '.git', 'dist'})
+
+# Patterns for the tool output parsed by MetricsCollector
+INSERTIONS_RE = re.compile(r'(\d+) insertions?')
+DELETIONS_RE = re.compile(r'(\d+) deletions?')
+MUTATION_SCORE_RE = re.compile(r'Mutation score: (\d+\.?\d*)%')
+COVERAGE_RE = re.compile(r'All files\s+\|\s+(\d+\.?\d*)')
+DEVIRT_SUCCESS_RE = re.compile(r'Success rate: (\d+\.?\d*)%')
+CONTRACTS_PASSING_RE = re.compile(r'(\d+) of (\d+) contracts passing')
+VITEST_TESTS_RE = re.compile(r'^\s*Tests\s+(.*)$', re.MULTILINE)  # e.g. "Tests  1 failed | 39 passed (40)"
+TESTS_PASSED_RE = re.compile(r'(\d+) passed')
+TESTS_FAILED_RE = re.compile(r'(\d+) failed')
+ANSI_ESCAPE_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+# npm audit severity weights; unknown severities count as 0.1
+SEVERITY_WEIGHTS = {
+    'critical': 1.0,
+    'high': 0.8,
+    'moderate': 0.5,
+    'low': 0.2,
+    'info': 0.1
+}
+
 class DecisionType(Enum):
     """Quality gate decision types"""
     PROMOTE = "PROMOTE"
     MANUAL_QA = "MANUAL_QA" 
     AGENT_REFINE = "AGENT_REFINE"
 
-@dataclass
+@dataclass(slots=True)
 class QualityMetrics:
     """Quality metrics for risk assessment"""
     delta_loc: float = 0.0          # Lines of code change ratio
@@ -48,7 +99,7 @@ class QualityMetrics:
     lift_time_ms: float = 0.0       # Average lift time
     memory_usage_mb: float = 0.0    # Peak memory usage
 
-@dataclass
+@dataclass(slots=True)
 class QualityGate:
     """Individual quality gate definition"""
     name: str
@@ -57,7 +108,7 @@ class QualityGate:
     threshold: Optional[Union[float, bool]] = None
     weight: float = 1.0
     
-@dataclass 
+@dataclass(slots=True)
 class GatekeeperResult:
     """Gatekeeper decision result"""
     decision: DecisionType
@@ -71,8 +122,28 @@ class GatekeeperResult:
 class QualityGateSystem:
     """Core quality gate system"""
     
+    # Gate name -> (metric attribute, pass condition against the gate threshold, failure warning)
+    _GATE_OPS = {
+        'mutation_testing': (
+            'mutation', operator.ge, "Mutation score {value:.3f} below threshold {threshold}"
+        ),
+        'sast_security': (
+            'static_severity', operator.le, "SAST severity {value:.3f} above threshold {threshold}"
+        ),
+        'contract_validation': (
+            'contract_pass_rate', operator.ge, "Contract pass rate {value:.3f} below threshold {threshold}"
+        ),
+        'devirtualization_rate': (
+            'devirt_success_rate', operator.ge, "Devirtualization rate {value:.3f} below threshold {threshold}"
+        ),
+        'build_success': (
+            'build_success', operator.eq, "Build failed or tests not passing"
+        ),
+    }
+    
     def __init__(self, config_path: Optional[Path] = None):
         self.gates = self._load_gates(config_path)
+        self._required_gate_names = frozenset(gate.name for gate in self.gates if gate.required)
         self.thresholds = {
             'T_mut': 0.80,      # Mutation test threshold
             'T_prop': 0.70,     # Promotion threshold
@@ -144,7 +215,12 @@ class QualityGateSystem:
         warnings = []
         
         for gate in self.gates:
-            passed, warning = self._evaluate_gate(gate, metrics)
+            try:
+                passed, warning = self._evaluate_gate(gate, metrics)
+            except Exception as e:
+                logger.error(f"Gate evaluation failed for '{gate.name}': {e}")
+                passed, warning = False, f"Gate evaluation error: {e}"
+            
             if passed:
                 passed_gates.append(gate.name)
             else:
@@ -189,44 +265,17 @@ class QualityGateSystem:
     
     def _evaluate_gate(self, gate: QualityGate, metrics: QualityMetrics) -> Tuple[bool, Optional[str]]:
         """Evaluate individual quality gate"""
-        warning = None
+        gate_op = self._GATE_OPS.get(gate.name)
+        if gate_op is None:
+            # Unknown gate - default to pass with warning
+            return True, f"Unknown gate '{gate.name}' - defaulting to pass"
         
-        try:
-            if gate.name == "mutation_testing":
-                passed = metrics.mutation >= gate.threshold
-                if not passed:
-                    warning = f"Mutation score {metrics.mutation:.3f} below threshold {gate.threshold}"
-            
-            elif gate.name == "sast_security":
-                passed = metrics.static_severity <= gate.threshold
-                if not passed:
-                    warning = f"SAST severity {metrics.static_severity:.3f} above threshold {gate.threshold}"
-            
-            elif gate.name == "contract_validation":
-                passed = metrics.contract_pass_rate >= gate.threshold
-                if not passed:
-                    warning = f"Contract pass rate {metrics.contract_pass_rate:.3f} below threshold {gate.threshold}"
-            
-            elif gate.name == "devirtualization_rate":
-                passed = metrics.devirt_success_rate >= gate.threshold
-                if not passed:
-                    warning = f"Devirtualization rate {metrics.devirt_success_rate:.3f} below threshold {gate.threshold}"
-            
-            elif gate.name == "build_success":
-                passed = metrics.build_success == gate.threshold
-                if not passed:
-                    warning = "Build failed or tests not passing"
-            
-            else:
-                # Unknown gate - default to pass with warning
-                passed = True
-                warning = f"Unknown gate '{gate.name}' - defaulting to pass"
-            
-            return passed, warning
-            
-        except Exception as e:
-            logger.error(f"Gate evaluation failed for '{gate.name}': {e}")
-            return False, f"Gate evaluation error: {e}"
+        metric, compare, warning_template = gate_op
+        value = getattr(metrics, metric)
+        if compare(value, gate.threshold):
+            return True, None
+        
+        return False, warning_template.format(value=value, threshold=gate.threshold)
     
     def _make_decision(
         self, 
@@ -237,8 +286,7 @@ class QualityGateSystem:
         """Make promotion decision based on risk score and gate results"""
         
         # Required gates must pass
-        required_failed = [gate.name for gate in self.gates 
-                          if gate.required and gate.name in failed_gates]
+        required_failed = [name for name in failed_gates if name in self._required_gate_names]
         
         if required_failed:
             logger.info(f"Required gates failed: {required_failed}")
@@ -252,71 +300,244 @@ class QualityGateSystem:
         else:
             return DecisionType.PROMOTE
 
+@dataclass(slots=True)
+class DiffSummary:
+    """Changes between HEAD~1 and HEAD, shared by the code and dependency metrics"""
+    changed_lines: int = 0                                   # Insertions plus deletions
+    file_statuses: List[str] = field(default_factory=list)   # Status letter per changed file
+    dependency_lines: int = 0                                # Changed package.json lines naming dependencies
+
 class MetricsCollector:
     """Collect quality metrics from various sources"""
     
-    def __init__(self, project_root: Path):
+    def __init__(self, project_root: Path, max_workers: Optional[int] = None, use_cache: bool = False):
         self.project_root = project_root
+        self.max_workers = max_workers
+        self.use_cache = use_cache
+        self._total_loc: Optional[int] = None
+        self._diff: Optional[DiffSummary] = None
+        self._diff_loaded = False
+        self._diff_lock = threading.Lock()
+        self._cmd_cache: Dict[Tuple[str, ...], subprocess.CompletedProcess] = {}
+        self._cmd_locks: Dict[Tuple[str, ...], threading.Lock] = {}
+        self._cmd_locks_guard = threading.Lock()
+        self._failures: List[str] = []  # Commands or collectors that produced no result
+    
+    def _run(self, cmd: List[str], cached: bool = True) -> subprocess.CompletedProcess:
+        """Run a command in the project root, executing each distinct command at most once.
+        
+        Concurrent collectors asking for the same command wait for the first
+        run instead of starting their own. Pass ``cached=False`` for runs that
+        must really execute again, such as flakiness reruns.
+        """
+        if not cached:
+            return self._execute(cmd)
+        
+        key = tuple(cmd)
+        with self._cmd_locks_guard:
+            lock = self._cmd_locks.setdefault(key, threading.Lock())
+        
+        with lock:
+            if key not in self._cmd_cache:
+                self._cmd_cache[key] = self._execute(cmd)
+            return self._cmd_cache[key]
+    
+    def _execute(self, cmd: List[str]) -> subprocess.CompletedProcess:
+        """Run a command in the project root, recording it if it produced no result"""
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.project_root)
+        except Exception:
+            self._failures.append(' '.join(cmd))
+            raise
+        
+        self._check_exit(cmd, result.returncode)
+        return result
+    
+    def _check_exit(self, cmd: List[str], returncode: int) -> None:
+        """Record a command whose exit status means it produced no result.
+        
+        Other nonzero statuses are results: npm audit exits 1 when advisories
+        exist, Stryker when the score is under its break threshold, and failing
+        builds and tests are exactly what the gates measure.
+        """
+        if returncode < 0 or returncode in NO_RESULT_EXIT_CODES:
+            self._failures.append(' '.join(cmd))
     
     def collect(self) -> QualityMetrics:
-        """Collect all quality metrics"""
+        """Collect all quality metrics, reusing cached results for an already-measured commit"""
+        head = self._cacheable_head() if self.use_cache else None
+        if head is None:
+            return self._collect_fresh()
+        
+        cached = self._load_cached_metrics(head)
+        if cached is not None:
+            logger.info(f"Using cached metrics for {head[:12]}")
+            return cached
+        
+        # An empty HEAD~1..HEAD diff leaves the tree, and so every test, audit
+        # and benchmark result, identical to the parent; only the diff metrics change
+        diff = self._diff_summary()
+        parent = self._run(['git', 'rev-parse', '--verify', '--quiet', 'HEAD~1']).stdout.strip()
+        if diff is not None and not diff.file_statuses and parent:
+            metrics = self._load_cached_metrics(parent)
+            if metrics is not None:
+                logger.info(f"No diff against {parent[:12]}, skipping heavy gates")
+                metrics.delta_loc = metrics.novelty = metrics.ext_dep_delta = 0.0
+                self._store_cached_metrics(head, metrics)
+                return metrics
+        
+        metrics = self._collect_fresh()
+        
+        # Collectors fall back to failing defaults when a command could not run,
+        # so such a run is not kept and the commit is measured again next time
+        if self._failures:
+            logger.info(f"Not caching metrics for {head[:12]}: {', '.join(self._failures)} produced no result")
+        else:
+            self._store_cached_metrics(head, metrics)
+        return metrics
+    
+    def _cacheable_head(self) -> Optional[str]:
+        """HEAD commit SHA when results for it can be cached, i.e. the working tree is clean"""
+        head = self._run(['git', 'rev-parse', '--verify', '--quiet', 'HEAD'])
+        # Untracked files are ignored: the collectors themselves leave dist/,
+        # coverage/ and Stryker output behind, which would make every rerun look dirty
+        status = self._run(['git', 'status', '--porcelain', '--untracked-files=no'])
+        
+        if head.returncode != 0 or status.returncode != 0 or status.stdout.strip():
+            return None
+        
+        return head.stdout.strip()
+    
+    def _metrics_cache_path(self, sha: str) -> Path:
+        """Cache file for a commit, distinct per project root within the repository"""
+        cache_home = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+        root_key = hashlib.sha256(str(self.project_root.resolve()).encode()).hexdigest()[:12]
+        return cache_home / 'arachne_gatekeeper' / f"{sha}-{root_key}.json"
+    
+    def _load_cached_metrics(self, sha: str) -> Optional[QualityMetrics]:
+        """Load cached metrics for a commit, or None when absent or unreadable"""
+        path = self._metrics_cache_path(sha)
+        if not path.exists():
+            return None
+        
+        try:
+            with open(path) as f:
+                return QualityMetrics(**json.load(f))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable metrics cache {path}: {e}")
+            return None
+    
+    def _store_cached_metrics(self, sha: str, metrics: QualityMetrics) -> None:
+        """Cache metrics for a commit; failures only cost a future re-collection"""
+        path = self._metrics_cache_path(sha)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(asdict(metrics), f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to cache metrics in {path}: {e}")
+    
+    def _collect_fresh(self) -> QualityMetrics:
+        """Run every collector"""
         logger.info("Collecting quality metrics...")
         
         metrics = QualityMetrics()
+        self._failures.clear()
         
-        # Code metrics
-        metrics.delta_loc = self._collect_loc_delta()
-        metrics.novelty = self._collect_novelty()
+        # The light collectors mostly wait on git and the npm registry, so threads
+        # overlap them
+        jobs = {
+            # Code metrics
+            'delta_loc': self._collect_loc_delta,
+            'novelty': self._collect_novelty,
+            # Dependency metrics
+            'ext_dep_delta': self._collect_dependency_delta,
+            # Security metrics
+            'static_severity': self._collect_sast_score,
+            # Performance metrics
+            'memory_usage_mb': self._collect_memory_metrics,
+        }
         
-        # Dependency metrics
-        metrics.ext_dep_delta = self._collect_dependency_delta()
+        # Stryker, vitest, tsc, the benchmarks and the differential runners each
+        # load every core already. Side by side they oversubscribe the machine and
+        # timing-sensitive tests fail, which would fail the build gate for a clean
+        # change, so the suites run one at a time next to the light collectors
+        suites = {
+            # Build metrics
+            'build_success': self._check_build_success,
+            # Test metrics
+            'mutation': self._collect_mutation_score,
+            'test_coverage': self._collect_test_coverage,
+            # Performance metrics
+            ('parse_time_ms', 'lift_time_ms'): self._collect_performance_metrics,
+            # Domain-specific metrics
+            'devirt_success_rate': self._collect_devirt_metrics,
+            'contract_pass_rate': self._collect_contract_metrics,
+        }
         
-        # Test metrics
-        metrics.mutation = self._collect_mutation_score()
-        metrics.test_coverage = self._collect_test_coverage()
-        metrics.flakiness = self._collect_test_flakiness()
+        max_workers = self.max_workers or min(len(jobs), (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix='suite') as suite_executor:
+            futures = {fields: executor.submit(collector) for fields, collector in jobs.items()}
+            futures.update(
+                (fields, suite_executor.submit(collector)) for fields, collector in suites.items()
+            )
         
-        # Security metrics
-        metrics.static_severity = self._collect_sast_score()
+            for fields, future in futures.items():
+                try:
+                    value = future.result()
+                except Exception as e:
+                    # Keep the field's default, as a failing collector does
+                    logger.warning(f"Failed to collect {fields}: {e}")
+                    self._failures.append(f"collector {fields}")
+                    continue
+                
+                if isinstance(fields, tuple):
+                    for name, item in zip(fields, value):
+                        setattr(metrics, name, item)
+                else:
+                    setattr(metrics, fields, value)
         
-        # Build metrics
-        metrics.build_success = self._check_build_success()
+        # Flakiness goes last, once nothing else is running, so that all of its
+        # passes run under the same load
+        metrics.flakiness = self._collect_test_flakiness()
         
-        # Performance metrics
-        metrics.parse_time_ms, metrics.lift_time_ms = self._collect_performance_metrics()
-        metrics.memory_usage_mb = self._collect_memory_metrics()
+        return metrics
+    
+    def _run_stream(self, cmd: List[str], pattern: re.Pattern) -> Tuple[int, Optional[str]]:
+        """Run a command and return its exit code and the first stdout line matching ``pattern``.
         
-        # Domain-specific metrics
-        metrics.devirt_success_rate = self._collect_devirt_metrics()
-        metrics.contract_pass_rate = self._collect_contract_metrics()
+        Output is read line by line and discarded, so memory stays bounded by
+        the longest line no matter how much the command prints.
+        """
+        matched_line = None
         
-        return metrics
+        try:
+            with subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, cwd=self.project_root
+            ) as process:
+                for line in process.stdout:
+                    if matched_line is None and pattern.search(line):
+                        matched_line = line
+        except Exception:
+            self._failures.append(' '.join(cmd))
+            raise
+        
+        self._check_exit(cmd, process.returncode)
+        return process.returncode, matched_line
     
     def _collect_loc_delta(self) -> float:
         """Calculate lines of code change ratio"""
         try:
-            result = subprocess.run(
-                ['git', 'diff', '--stat', 'HEAD~1', 'HEAD'],
-                capture_output=True, text=True, cwd=self.project_root
-            )
-            
-            if result.returncode != 0:
-                return 0.0
-            
-            # Parse git diff stat output
-            lines = result.stdout.strip().split('\n')
-            if not lines:
+            diff = self._diff_summary()
+            if diff is None or diff.changed_lines == 0:
                 return 0.0
             
-            # Extract changed lines from summary line
-            summary = lines[-1] if lines else ""
-            if "insertions" in summary or "deletions" in summary:
-                # Simple heuristic: normalize by codebase size
-                total_loc = self._get_total_loc()
-                changed_lines = self._parse_changed_lines(summary)
-                return min(1.0, changed_lines / max(total_loc, 1))
-            
-            return 0.0
+            # Simple heuristic: normalize by codebase size
+            total_loc = self._get_total_loc()
+            return min(1.0, diff.changed_lines / max(total_loc, 1))
             
         except Exception as e:
             logger.warning(f"Failed to collect LOC delta: {e}")
@@ -325,20 +546,13 @@ class MetricsCollector:
     def _collect_novelty(self) -> float:
         """Calculate new code/pattern ratio"""
         try:
-            # Check for new files
-            result = subprocess.run(
-                ['git', 'diff', '--name-status', 'HEAD~1', 'HEAD'],
-                capture_output=True, text=True, cwd=self.project_root
-            )
-            
-            if result.returncode != 0:
+            diff = self._diff_summary()
+            if diff is None or not diff.file_statuses:
                 return 0.0
             
-            lines = result.stdout.strip().split('\n')
-            new_files = sum(1 for line in lines if line.startswith('A\t'))
-            total_changes = len(lines)
-            
-            return new_files / max(total_changes, 1) if total_changes > 0 else 0.0
+            # Check for new files
+            new_files = sum(1 for status in diff.file_statuses if status == 'A')
+            return new_files / len(diff.file_statuses)
             
         except Exception as e:
             logger.warning(f"Failed to collect novelty: {e}")
@@ -347,37 +561,92 @@ class MetricsCollector:
     def _collect_dependency_delta(self) -> float:
         """Calculate external dependency change ratio"""
         try:
-            # Check for package.json changes
-            result = subprocess.run(
-                ['git', 'diff', 'HEAD~1', 'HEAD', '--', 'package.json'],
-                capture_output=True, text=True, cwd=self.project_root
-            )
-            
-            if result.returncode != 0 or not result.stdout:
+            diff = self._diff_summary()
+            if diff is None or diff.dependency_lines == 0:
                 return 0.0
             
-            # Count dependency additions/removals
-            diff_lines = result.stdout.split('\n')
-            dep_changes = sum(1 for line in diff_lines 
-                            if ('dependencies' in line or 'devDependencies' in line)
-                            and (line.startswith('+') or line.startswith('-')))
-            
             # Normalize by total dependencies
             total_deps = self._count_total_dependencies()
-            return min(1.0, dep_changes / max(total_deps, 1))
+            return min(1.0, diff.dependency_lines / max(total_deps, 1))
             
         except Exception as e:
             logger.warning(f"Failed to collect dependency delta: {e}")
             return 0.0
     
+    def _diff_summary(self) -> Optional[DiffSummary]:
+        """Summarize HEAD~1..HEAD once per run; None when there is no such range"""
+        with self._diff_lock:
+            if not self._diff_loaded:
+                diff = None
+                if HAS_PYGIT2:
+                    try:
+                        diff = self._diff_summary_pygit2()
+                    except Exception as e:
+                        logger.debug(f"pygit2 diff failed, falling back to git: {e}")
+                
+                self._diff = diff if diff is not None else self._diff_summary_git()
+                self._diff_loaded = True
+            
+            return self._diff
+    
+    def _diff_summary_pygit2(self) -> DiffSummary:
+        """Summarize HEAD~1..HEAD in-process with pygit2"""
+        repo = pygit2.Repository(pygit2.discover_repository(str(self.project_root)))
+        diff = repo.diff('HEAD~1', 'HEAD')
+        diff.find_similar()  # Report renames like git diff does
+        
+        # package.json of this project, as a path inside the repository
+        package_json = (self.project_root.resolve() / 'package.json').relative_to(
+            Path(repo.workdir).resolve()
+        ).as_posix()
+        
+        summary = DiffSummary(changed_lines=diff.stats.insertions + diff.stats.deletions)
+        for index, delta in enumerate(diff.deltas):
+            summary.file_statuses.append(delta.status_char())
+            
+            if package_json in (delta.old_file.path, delta.new_file.path):
+                # Count dependency additions/removals
+                summary.dependency_lines += sum(
+                    1 for hunk in diff[index].hunks for line in hunk.lines
+                    if line.origin in '+-'
+                    and ('dependencies' in line.content or 'devDependencies' in line.content)
+                )
+        
+        return summary
+    
+    def _diff_summary_git(self) -> Optional[DiffSummary]:
+        """Summarize HEAD~1..HEAD from git CLI output"""
+        stat = self._run(['git', 'diff', '--stat', 'HEAD~1', 'HEAD'])
+        name_status = self._run(['git', 'diff', '--name-status', 'HEAD~1', 'HEAD'])
+        package_diff = self._run(['git', 'diff', 'HEAD~1', 'HEAD', '--', 'package.json'])
+        
+        if any(result.returncode != 0 for result in (stat, name_status, package_diff)):
+            return None
+        
+        summary = DiffSummary()
+        
+        # Extract changed lines from summary line
+        stat_lines = stat.stdout.strip().split('\n')
+        summary.changed_lines = self._parse_changed_lines(stat_lines[-1])
+        
+        summary.file_statuses = [
+            line[:1] for line in name_status.stdout.splitlines() if line
+        ]
+        
+        # Count dependency additions/removals
+        summary.dependency_lines = sum(
+            1 for line in package_diff.stdout.split('\n')
+            if ('dependencies' in line or 'devDependencies' in line)
+            and (line.startswith('+') or line.startswith('-'))
+        )
+        
+        return summary
+    
     def _collect_mutation_score(self) -> float:
         """Collect mutation testing score"""
         try:
             # Run mutation testing
-            result = subprocess.run(
-                ['npm', 'run', 'test:mutation'],
-                capture_output=True, text=True, cwd=self.project_root
-            )
+            result = self._run(['npm', 'run', 'test:mutation'])
             
             if result.returncode != 0:
                 logger.warning(f"Mutation testing failed: {result.stderr}")
@@ -399,16 +668,14 @@ class MetricsCollector:
     def _collect_test_coverage(self) -> float:
         """Collect test coverage percentage"""
         try:
-            result = subprocess.run(
-                ['npm', 'run', 'test:coverage'],
-                capture_output=True, text=True, cwd=self.project_root
-            )
+            # Coverage tables can be long; only the summary line is kept
+            returncode, summary = self._run_stream(['npm', 'run', 'test:coverage'], COVERAGE_RE)
             
-            if result.returncode != 0:
+            if returncode != 0 or summary is None:
                 return 0.0
             
             # Parse coverage from output
-            return self._parse_coverage(result.stdout)
+            return self._parse_coverage(summary)
             
         except Exception as e:
             logger.warning(f"Failed to collect test coverage: {e}")
@@ -417,19 +684,25 @@ class MetricsCollector:
     def _collect_test_flakiness(self) -> float:
         """Calculate test flakiness ratio"""
         try:
-            # Run tests multiple times to detect flakiness
-            flaky_tests = 0
-            total_tests = 0
-            
-            for run in range(3):  # Run 3 times
-                result = subprocess.run(
-                    ['npm', 'test'],
-                    capture_output=True, text=True, cwd=self.project_root
-                )
-                # Would need to parse test results and track failures
-                # This is a simplified placeholder
+            # Run tests 3 times to detect flakiness. Every pass is fresh and they
+            # run side by side, so each sees the same load; reusing the build
+            # check's run, made under other load, would score load-induced
+            # failures as flaky. With fewer than 3 jobs they run one at a time.
+            workers = 3 if (self.max_workers or 3) >= 3 else 1
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda _: self._run(['npm', 'test'], cached=False), range(3)
+                ))
+            
+            counts = [self._parse_test_counts(result.stdout) for result in results]
+            counts = [count for count in counts if count is not None]
+            if len(counts) < 2:
+                return 0.0
             
-            return 0.0  # Placeholder
+            # Spread of the failure count across runs, relative to the suite size
+            failed = [failed for _, failed in counts]
+            total = statistics.mean(passed + failed for passed, failed in counts)
+            return min(1.0, statistics.pstdev(failed) / max(total, 1))
             
         except Exception as e:
             logger.warning(f"Failed to collect test flakiness: {e}")
@@ -438,13 +711,10 @@ class MetricsCollector:
     def _collect_sast_score(self) -> float:
         """Collect SAST (Static Application Security Testing) score"""
         try:
-            result = subprocess.run(
-                ['npm', 'audit', '--json'],
-                capture_output=True, text=True, cwd=self.project_root
-            )
+            result = self._run(['npm', 'audit', '--json'])
             
             if result.returncode == 0:
-                audit_data = json.loads(result.stdout)
+                audit_data = orjson.loads(result.stdout) if HAS_ORJSON else json.loads(result.stdout)
                 # Calculate severity score based on vulnerabilities
                 return self._calculate_sast_severity(audit_data)
             
@@ -458,19 +728,13 @@ class MetricsCollector:
         """Check if build and tests pass"""
         try:
             # Check build
-            build_result = subprocess.run(
-                ['npm', 'run', 'build'],
-                capture_output=True, text=True, cwd=self.project_root
-            )
+            build_result = self._run(['npm', 'run', 'build'])
             
             if build_result.returncode != 0:
                 return False
             
             # Check tests
-            test_result = subprocess.run(
-                ['npm', 'test'],
-                capture_output=True, text=True, cwd=self.project_root  
-            )
+            test_result = self._run(['npm', 'test'])
             
             return test_result.returncode == 0
             
@@ -482,10 +746,7 @@ class MetricsCollector:
         """Collect performance metrics (parse time, lift time)"""
         try:
             # Run performance benchmarks
-            result = subprocess.run(
-                ['npm', 'run', 'bench'],
-                capture_output=True, text=True, cwd=self.project_root
-            )
+            result = self._run(['npm', 'run', 'bench'])
             
             if result.returncode != 0:
                 return 0.0, 0.0
@@ -506,10 +767,7 @@ class MetricsCollector:
         """Collect devirtualization success rate"""
         try:
             # Run devirtualization tests
-            result = subprocess.run(
-                ['npm', 'run', 'test:devirt'],
-                capture_output=True, text=True, cwd=self.project_root
-            )
+            result = self._run(['npm', 'run', 'test:devirt'])
             
             if result.returncode != 0:
                 return 0.0
@@ -525,10 +783,7 @@ class MetricsCollector:
         """Collect contract validation pass rate"""
         try:
             # Run contract tests
-            result = subprocess.run(
-                ['npm', 'run', 'test:contracts'],
-                capture_output=True, text=True, cwd=self.project_root
-            )
+            result = self._run(['npm', 'run', 'test:contracts'])
             
             if result.returncode != 0:
                 return 0.0
@@ -543,29 +798,36 @@ class MetricsCollector:
     # Helper methods
     def _get_total_loc(self) -> int:
         """Get total lines of code in project"""
-        try:
-            result = subprocess.run(
-                ['find', str(self.project_root), '-name', '*.ts', '-exec', 'wc', '-l', '{}', '+'],
-                capture_output=True, text=True
-            )
-            
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                total = sum(int(line.split()[0]) for line in lines if line.strip())
-                return total
-            
-            return 1000  # Default estimate
-            
-        except Exception:
-            return 1000
+        if self._total_loc is None:
+            try:
+                self._total_loc = self._count_ts_lines()
+            except Exception:
+                self._total_loc = 1000  # Default estimate
+        
+        return self._total_loc
+    
+    def _count_ts_lines(self) -> int:
+        """Count newlines in the project's TypeScript sources, skipping vendored and build output"""
+        total = 0
+        pending = [self.project_root]
+        
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in LOC_SKIP_DIRS:
+                            pending.append(entry.path)
+                    elif entry.name.endswith('.ts') and entry.is_file():
+                        with open(entry.path, 'rb') as f:
+                            total += f.read().count(b'\n')
+        
+        return total
     
     def _parse_changed_lines(self, summary: str) -> int:
         """Parse changed lines from git diff summary"""
-        import re
-        
         # Extract insertions and deletions
-        insertions = re.search(r'(\d+) insertions?', summary)
-        deletions = re.search(r'(\d+) deletions?', summary)
+        insertions = INSERTIONS_RE.search(summary)
+        deletions = DELETIONS_RE.search(summary)
         
         ins_count = int(insertions.group(1)) if insertions else 0
         del_count = int(deletions.group(1)) if deletions else 0
@@ -592,10 +854,8 @@ class MetricsCollector:
     
     def _parse_mutation_score(self, output: str) -> float:
         """Parse mutation score from tool output"""
-        import re
-        
         # This would need to match specific mutation testing tool output
-        match = re.search(r'Mutation score: (\d+\.?\d*)%', output)
+        match = MUTATION_SCORE_RE.search(output)
         if match:
             return float(match.group(1)) / 100.0
         
@@ -603,41 +863,44 @@ class MetricsCollector:
     
     def _parse_coverage(self, output: str) -> float:
         """Parse coverage percentage from output"""
-        import re
-        
         # Look for coverage percentage in output
-        match = re.search(r'All files\s+\|\s+(\d+\.?\d*)', output)
+        match = COVERAGE_RE.search(output)
         if match:
             return float(match.group(1)) / 100.0
         
         return 0.0
     
+    def _parse_test_counts(self, output: str) -> Optional[Tuple[int, int]]:
+        """Parse passed and failed test counts from the vitest summary"""
+        summary = VITEST_TESTS_RE.search(ANSI_ESCAPE_RE.sub('', output))
+        if not summary:
+            return None
+        
+        passed = TESTS_PASSED_RE.search(summary.group(1))
+        failed = TESTS_FAILED_RE.search(summary.group(1))
+        
+        return (int(passed.group(1)) if passed else 0, int(failed.group(1)) if failed else 0)
+    
     def _calculate_sast_severity(self, audit_data: dict) -> float:
         """Calculate SAST severity score from npm audit data"""
         if 'vulnerabilities' not in audit_data:
             return 0.0
         
         vulnerabilities = audit_data['vulnerabilities']
+        if not vulnerabilities:
+            return 0.0
         
-        # Weight by severity
-        severity_weights = {
-            'critical': 1.0,
-            'high': 0.8,
-            'moderate': 0.5,
-            'low': 0.2,
-            'info': 0.1
-        }
-        
-        total_score = 0.0
-        max_score = 0.0
-        
-        for vuln_name, vuln_data in vulnerabilities.items():
-            severity = vuln_data.get('severity', 'low')
-            weight = severity_weights.get(severity, 0.1)
-            total_score += weight
-            max_score += 1.0  # Maximum possible weight
+        # Weight by severity: tally each level once instead of per vulnerability
+        severity_counts = Counter(
+            vuln_data.get('severity', 'low') for vuln_data in vulnerabilities.values()
+        )
+        total_score = sum(
+            SEVERITY_WEIGHTS.get(severity, 0.1) * count
+            for severity, count in severity_counts.items()
+        )
         
-        return total_score / max_score if max_score > 0 else 0.0
+        # Every vulnerability can contribute at most a weight of 1.0
+        return total_score / len(vulnerabilities)
     
     def _parse_performance_results(self, output: str) -> Tuple[float, float]:
         """Parse performance benchmark results"""
@@ -646,10 +909,8 @@ class MetricsCollector:
     
     def _parse_devirt_results(self, output: str) -> float:
         """Parse devirtualization test results"""
-        import re
-        
         # Look for success rate in output
-        match = re.search(r'Success rate: (\d+\.?\d*)%', output)
+        match = DEVIRT_SUCCESS_RE.search(output)
         if match:
             return float(match.group(1)) / 100.0
         
@@ -657,10 +918,8 @@ class MetricsCollector:
     
     def _parse_contract_results(self, output: str) -> float:
         """Parse contract test results"""
-        import re
-        
         # Look for pass rate in output
-        match = re.search(r'(\d+) of (\d+) contracts passing', output)
+        match = CONTRACTS_PASSING_RE.search(output)
         if match:
             passed = int(match.group(1))
             total = int(match.group(2))
@@ -687,6 +946,17 @@ def main():
         type=Path,
         help='Output file for results (JSON format)'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='Light collectors (git, audit, LOC) and flakiness passes to run in parallel '
+             '(default: one per collector, up to 2x CPU count); test suites always run one at a time'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Reuse metrics cached for an already-measured commit (clean working tree only)'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -702,7 +972,7 @@ def main():
     
     try:
         # Collect metrics
-        collector = MetricsCollector(args.project_root)
+        collector = MetricsCollector(args.project_root, max_workers=args.jobs, use_cache=args.cache)
         metrics = collector.collect()
         
         logger.info(f"Collected metrics: mutation={metrics.mutation:.3f}, "
@@ -736,8 +1006,11 @@ def main():
                 'timestamp': time.time()
             }
             
-            with open(args.output, 'w') as f:
-                json.dump(output_data, f, indent=2)
+            if HAS_ORJSON:
+                args.output.write_bytes(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(args.output, 'w') as f:
+                    json.dump(output_data, f, indent=2)
         
         # Set exit code based on decision
         if result.decision == DecisionType.PROMOTE: